@@ -0,0 +1,88 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+# cython: initializedcheck=False, infer_types=True
+# Compiled versions of EMD._parse_vertices / EMD._parse_faces.
+# Build with `python setup.py build_ext --inplace`; emd.py falls back to
+# its NumPy parsers when this module is not available.
+#
+# Bounds checking is disabled module-wide; each parser validates the
+# extent of its chunk against buf.shape[0] before touching the buffer.
+
+from libc.stdint cimport int16_t, uint32_t
+
+
+cdef inline int16_t _read_i16(const unsigned char* p):
+    return <int16_t>(p[0] | (p[1] << 8))
+
+
+cdef inline uint32_t _read_u32(const unsigned char* p):
+    return p[0] | (p[1] << 8) | (p[2] << 16) | (<uint32_t>p[3] << 24)
+
+
+def parse_vertices(const unsigned char[::1] buf, Py_ssize_t offset,
+                   list vertices, list addr_vertices, unsigned int temp,
+                   double inv_scale):
+    # chunk_id == 0, returns the offset just past the chunk
+    cdef Py_ssize_t n_verts = temp & 255
+    cdef Py_ssize_t vert_offset = offset + 4
+    cdef Py_ssize_t i
+    cdef const unsigned char* p
+
+    if n_verts == 0:
+        return vert_offset
+    if vert_offset + (n_verts - 1) * 12 + 6 > buf.shape[0]:
+        # We reached EOF or partial read
+        raise ValueError("Not enough bytes to read a vertex.")
+
+    p = &buf[vert_offset]
+    for i in range(n_verts):
+        vertices.append((_read_i16(p) * inv_scale,
+                         _read_i16(p + 2) * inv_scale,
+                         _read_i16(p + 4) * inv_scale))
+        addr_vertices.append(vert_offset + i * 12)
+        p += 12
+
+    return vert_offset + n_verts * 12
+
+
+def parse_faces(const unsigned char[::1] buf, Py_ssize_t offset,
+                list faces, unsigned int temp, bint triangle=True):
+    # chunk_id == 52 / 60, returns the offset just past the chunk
+    cdef Py_ssize_t n_face = temp & 255
+    cdef Py_ssize_t face_offset = offset + 4
+    cdef Py_ssize_t i
+    cdef const unsigned char* p
+    cdef uint32_t r10, f1, f2, f3, f4
+
+    if n_face == 0:
+        return face_offset
+    if face_offset + (n_face - 1) * 12 + 4 > buf.shape[0]:
+        # We reached EOF or partial read
+        raise ValueError("Not enough bytes to read a face.")
+
+    p = &buf[face_offset]
+    for i in range(n_face):
+        r10 = _read_u32(p)
+        if triangle:
+            # Triangular faces: chunk_id == 52
+            f1 = ((r10 << 3) & 2040) >> 3
+            f2 = ((r10 >> 5) & 2040) >> 3
+            f3 = ((r10 >> 13) & 2040) >> 3
+            # Winding alternates, starting with a flipped face
+            if i & 1:
+                faces.append((f1, f2, f3))
+            else:
+                faces.append((f1, f3, f2))
+        else:
+            # Quad faces: chunk_id == 60
+            f1 = ((r10 << 3) & 1016) >> 3
+            f2 = ((r10 >> 4) & 1016) >> 3
+            f3 = ((r10 >> 11) & 1016) >> 3
+            f4 = ((r10 >> 18) & 1016) >> 3
+            # Add the derived triangles
+            faces.append((f1, f2, f3))
+            faces.append((f1, f2, f4))
+            faces.append((f1, f3, f4))
+            faces.append((f2, f3, f4))
+        p += 12
+
+    return face_offset + n_face * 12
@@ -0,0 +1,9 @@
+from setuptools import setup
+from Cython.Build import cythonize
+
+# Builds the optional compiled parsers used by emd.py:
+#   python setup.py build_ext --inplace
+setup(
+    name="EMDTool",
+    ext_modules=cythonize("_emd_parse.pyx", language_level=3),
+)
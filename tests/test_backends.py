@@ -0,0 +1,179 @@
+# Checks that every parser backend in emd.py gives the same result:
+# the array.array fallback, NumPy, the compiled _emd_parse and Numba.
+# Run with `python -m pytest tests`; missing backends are skipped.
+
+import math
+import os
+import struct
+import sys
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+try:
+    import bpy
+except ImportError:
+    # Outside Blender, emd.py only needs bpy for the operator class
+    bpy = types.ModuleType('bpy')
+    bpy.props = types.SimpleNamespace(StringProperty=lambda **kwargs: None)
+    bpy.types = types.SimpleNamespace(Operator=object)
+    sys.modules['bpy'] = bpy
+
+import emd
+
+# Captured before the fixtures below patch it out of emd
+np = emd.np
+
+SIGNATURE = 0xDEADBEEF
+
+BACKENDS = ['array', 'numpy', 'cython', 'numba']
+
+
+def chunk(chunk_id, records):
+    # A chunk word followed by its 12-byte records
+    return struct.pack('<I', (chunk_id << 24) | len(records)) + b''.join(records)
+
+
+def vertex(x, y, z):
+    return struct.pack('<3h6x', x, y, z)
+
+
+def face(r10):
+    return struct.pack('<I8x', r10)
+
+
+def emd_file(blocks):
+    # Header: file size = (size_base << 2) + addend, first block at addend
+    body = b''.join(struct.pack('<I', SIGNATURE) + b''.join(chunks) for chunks in blocks)
+    size_base = (len(body) + 3) // 4
+    data = struct.pack('<8x4H', 16, size_base, 0, 0) + body
+    return data + bytes((size_base << 2) + 16 - len(data))
+
+
+def tris(n, seed):
+    return [face((seed * 2654435761 + i * 40503) & 0xFFFFFFFF) for i in range(n)]
+
+
+def verts(n, seed):
+    return [vertex((seed + i * 97) % 65536 - 32768, i * 3 - 100, -i) for i in range(n)]
+
+
+VALID = emd_file([
+    [chunk(0, verts(5, 1)), chunk(52, tris(3, 2)), chunk(60, tris(2, 3))],
+    [chunk(0, verts(255, 4)), chunk(52, tris(200, 5)), chunk(60, tris(70, 6))],
+    [chunk(0, [])],
+    [chunk(0, verts(2, 7)), chunk(0, verts(1, 8)), chunk(52, tris(1, 9))],
+])
+
+# The last chunk claims more records than the file holds. Face chunks of
+# at least emd._NUMPY_MIN_FACES reach the NumPy decoder, smaller ones don't
+TRUNCATED = {
+    'vertices': emd_file([[chunk(0, verts(100, 1))]])[:-40],
+    'small faces': emd_file([[chunk(0, verts(3, 1)), chunk(52, tris(4, 2))]])[:-20],
+    'triangles': emd_file([[chunk(0, verts(3, 1)), chunk(52, tris(100, 2))]])[:-40],
+    'quads': emd_file([[chunk(0, verts(3, 1)), chunk(60, tris(emd._NUMPY_MIN_FACES, 3))]])[:-40],
+}
+
+UNSUPPORTED = emd_file([[chunk(0, verts(3, 1)), chunk(7, [bytes(12)])]])
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request, monkeypatch):
+    if request.param == 'array':
+        monkeypatch.setattr(emd, 'np', None)
+        monkeypatch.setattr(emd, '_emd_parse', None)
+        monkeypatch.setattr(emd, '_parse_all', None)
+    elif request.param == 'numpy':
+        if emd.np is None:
+            pytest.skip("NumPy is not installed")
+        monkeypatch.setattr(emd, '_emd_parse', None)
+        monkeypatch.setattr(emd, '_parse_all', None)
+    elif request.param == 'cython':
+        try:
+            import _emd_parse
+        except ImportError:
+            pytest.skip("_emd_parse is not built")
+        monkeypatch.setattr(emd, '_emd_parse', _emd_parse)
+    elif request.param == 'numba':
+        if emd._parse_all is None:
+            pytest.skip("Numba is not installed")
+        monkeypatch.setattr(emd, '_emd_parse', None)
+    return request.param
+
+
+def parse(tmp_path, data):
+    path = tmp_path / 'model.emd'
+    path.write_bytes(data)
+    return emd.EMD(str(path)).obj_info
+
+
+def values(obj):
+    # One obj_info entry as (vertices, addresses, faces) nested lists
+    return tuple(field.tolist() if np is not None and isinstance(field, np.ndarray)
+                 else [list(row) if isinstance(row, tuple) else row for row in field]
+                 for field in (obj['vertex'], obj['vertex addr'], obj['face']))
+
+
+def parse_reference(tmp_path, data, monkeypatch):
+    with monkeypatch.context() as m:
+        m.setattr(emd, 'np', None)
+        m.setattr(emd, '_emd_parse', None)
+        m.setattr(emd, '_parse_all', None)
+        return parse(tmp_path, data)
+
+
+def test_reference_values(tmp_path, monkeypatch):
+    data = emd_file([[chunk(0, [vertex(3277, -3277, 0)]),
+                      chunk(52, [face(1 | 2 << 8 | 3 << 16)] * 2),
+                      chunk(60, [face(1 | 2 << 7 | 3 << 14 | 4 << 21)])]])
+    (obj,) = map(values, parse_reference(tmp_path, data, monkeypatch))
+    assert obj[0] == [[pytest.approx(3277 / 3276.8), pytest.approx(-3277 / 3276.8), 0.0]]
+    assert obj[1] == [24]
+    assert obj[2] == [[1, 3, 2], [1, 2, 3],
+                      [1, 2, 3], [1, 2, 4], [1, 3, 4], [2, 3, 4]]
+
+
+def test_valid(tmp_path, monkeypatch, backend):
+    expected = [values(obj) for obj in parse_reference(tmp_path, VALID, monkeypatch)]
+    result = [values(obj) for obj in parse(tmp_path, VALID)]
+
+    assert len(result) == len(expected) == 4
+    for (vertices, addrs, faces), (exp_vertices, exp_addrs, exp_faces) in zip(result, expected):
+        assert addrs == exp_addrs
+        assert faces == exp_faces
+        assert len(vertices) == len(exp_vertices)
+        for v, exp_v in zip(vertices, exp_vertices):
+            # The NumPy and Numba paths scale in float32
+            assert all(math.isclose(c, e, rel_tol=1e-6, abs_tol=1e-6)
+                       for c, e in zip(v, exp_v))
+
+
+def test_types(tmp_path, backend):
+    # Every backend hands out arrays when NumPy is available, lists otherwise
+    for obj in parse(tmp_path, VALID):
+        if backend == 'array':
+            assert type(obj['vertex']) is list
+            assert type(obj['vertex addr']) is list
+            assert type(obj['face']) is list
+            assert all(type(v) is tuple for v in obj['vertex'])
+            assert all(type(f) is tuple for f in obj['face'])
+        else:
+            for field, dtype in (('vertex', np.float32), ('vertex addr', np.int64), ('face', np.int32)):
+                assert type(obj[field]) is np.ndarray
+                assert obj[field].dtype == dtype
+            assert obj['vertex'].shape[1:] == (3,)
+            assert obj['vertex addr'].shape == (len(obj['vertex']),)
+            assert obj['face'].shape[1:] == (3,)
+
+
+@pytest.mark.parametrize('case', TRUNCATED)
+def test_truncated(tmp_path, backend, case):
+    with pytest.raises(ValueError, match="^Not enough bytes"):
+        parse(tmp_path, TRUNCATED[case])
+
+
+def test_unsupported_chunk(tmp_path, backend):
+    with pytest.raises(NotImplementedError):
+        parse(tmp_path, UNSUPPORTED)